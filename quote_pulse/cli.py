@@ -28,7 +28,8 @@ def cli():
 @click.option('--max-pages', default=None, type=int, help='Max pages to scrape')
 @click.option('--timeout', default=10, type=int, help='Scraper timeout')
 @click.option('--screenshot-on-fail', default='./artifacts/failures/', help='Path to save failure artifacts')
-def scrape(db, headless, max_pages, timeout, screenshot_on_fail):
+@click.option('--full-report', is_flag=True, help='List every new, changed and disappeared quote in the reports')
+def scrape(db, headless, max_pages, timeout, screenshot_on_fail, full_report):
     is_headless = headless.lower() == 'true'
     engine = Engine(db, headless=is_headless, timeout=timeout, failure_dir=screenshot_on_fail)
     
@@ -36,7 +37,7 @@ def scrape(db, headless, max_pages, timeout, screenshot_on_fail):
     results = engine.run_scrape(max_pages=max_pages)
     
     reporter = ReportGenerator(engine.db)
-    md_path, pdf_path, stats_path = reporter.generate_all(results)
+    md_path, pdf_path, stats_path = reporter.generate_all(results, full=full_report)
     
     click.echo("\nScrape complete!")
     click.echo(f"New quotes: {len(results['new_quotes'])}")
@@ -68,6 +69,39 @@ def report(last, db):
         # but the prompt just says "prints last run report path + summary"
         click.echo("\nCheck 'reports/' folder for the detailed MD and PDF files.")
 
+@cli.command()
+@click.option('--by', type=click.Choice(['run', 'day', 'week', 'month']), default='day', help='How to bucket runs')
+@click.option('--since', default=None, type=click.DateTime(formats=['%Y-%m-%d']), help='Only include runs started on or after this date (YYYY-MM-DD)')
+@click.option('--until', default=None, type=click.DateTime(formats=['%Y-%m-%d']), help='Only include runs started before this date (YYYY-MM-DD)')
+@click.option('--last-runs', default=None, type=click.IntRange(min=1), help='Only include the N most recent runs in the window')
+@click.option('--top-tags', default=10, type=int, help='Number of drifting tags to show')
+@click.option('--db', default='./data/quotes.db', help='Path to SQLite database')
+def trends(by, since, until, last_runs, top_tags, db):
+    database = Database(db)
+    # started_at is stored as ISO text, so the window bounds are compared as ISO dates
+    since = since.date().isoformat() if since else None
+    until = until.date().isoformat() if until else None
+    rows = database.get_run_diff_trends(by=by, since=since, until=until, last_runs=last_runs)
+    if not rows:
+        click.echo("No successful runs in the selected window.")
+        return
+
+    click.echo(f"{by.capitalize():<38} {'Runs':>5} {'Seen':>6} {'New':>6} {'Changed':>8} {'Gone':>6} {'Back':>6} {'Churn':>6} {'Growth':>7}")
+    for row in rows:
+        click.echo(
+            f"{row['bucket']:<38} {row['runs']:>5} {row['quotes_seen'] or 0:>6} {row['new']:>6} "
+            f"{row['changed']:>8} {row['disappeared']:>6} {row['reappeared']:>6} {row['churn']:>6} {row['net_growth']:>+7}"
+        )
+
+    click.echo(f"\nTotal churn: {sum(row['churn'] for row in rows)}")
+    click.echo(f"Net growth: {sum(row['net_growth'] for row in rows):+}")
+
+    drift = database.get_tag_drift(since=since, until=until, last_runs=last_runs, limit=top_tags)
+    if drift:
+        click.echo("\nTag drift (tag edits on existing quotes):")
+        for row in drift:
+            click.echo(f"  {row['tag']:<30} +{row['added']:<5} -{row['removed']:<5} net {row['net']:+}")
+
 @cli.command()
 @click.option('--format', type=click.Choice(['csv', 'json']), default='csv')
 @click.option('--out', default='./exports/quotes.csv')
@@ -80,15 +114,15 @@ def export(format, out, db):
     
     if format == 'json':
         with open(out, 'w', encoding='utf-8') as f:
-            json.dump(quotes, f, indent=4)
+            json.dump([dict(q) for q in quotes], f, indent=4)
     else:
         if not quotes:
             click.echo("No quotes to export.")
             return
-        keys = quotes[0].keys()
+        # Rows are sequences in column order, so they can be written as-is
         with open(out, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
+            writer = csv.writer(f)
+            writer.writerow(quotes[0].keys())
             writer.writerows(quotes)
             
     click.echo(f"Exported {len(quotes)} quotes to {out}")
@@ -14,7 +14,10 @@ class Database:
         self._init_db()
 
     def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        # sqlite3.Row supports lookups by column name without building a dict per row
+        conn.row_factory = sqlite3.Row
+        return conn
 
     def _init_db(self):
         with self._get_connection() as conn:
@@ -56,6 +59,21 @@ class Database:
                     PRIMARY KEY(run_id, quote_id)
                 )
             ''')
+
+            # Run diffs table: what each run added, changed and lost, written at ingest time
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS run_diffs (
+                    run_id TEXT,
+                    quote_id TEXT,
+                    change_type TEXT NOT NULL,
+                    tags_before_json TEXT,
+                    tags_after_json TEXT,
+                    FOREIGN KEY(run_id) REFERENCES runs(run_id),
+                    FOREIGN KEY(quote_id) REFERENCES quotes(quote_id),
+                    PRIMARY KEY(run_id, quote_id)
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at)")
             conn.commit()
 
     def start_run(self):
@@ -81,14 +99,11 @@ class Database:
     def get_quote(self, quote_id):
         with self._get_connection() as conn:
             cursor = conn.execute("SELECT * FROM quotes WHERE quote_id = ?", (quote_id,))
-            row = cursor.fetchone()
-            if row:
-                columns = [column[0] for column in cursor.description]
-                return dict(zip(columns, row))
-            return None
+            return cursor.fetchone()
 
-    def upsert_quote(self, quote_data):
-        quote_id = quote_data['quote_id']
+    def upsert_quote(self, quote):
+        quote_id = quote.quote_id
+        tags_json = quote.tags_json
         now = datetime.utcnow().isoformat()
         
         with self._get_connection() as conn:
@@ -98,15 +113,16 @@ class Database:
                 # The user said: "Update" for tag changes
                 conn.execute(
                     "UPDATE quotes SET last_seen_at = ?, tags_json = ?, author_url = ? WHERE quote_id = ?",
-                    (now, quote_data['tags_json'], quote_data['author_url'], quote_id)
+                    (now, tags_json, quote.author_url, quote_id)
                 )
-                return 'updated' if existing['tags_json'] != quote_data['tags_json'] else 'seen'
+                status = 'updated' if existing['tags_json'] != tags_json else 'seen'
+                return status, existing['tags_json']
             else:
                 conn.execute(
                     "INSERT INTO quotes (quote_id, quote_text, author_name, author_url, tags_json, first_seen_at, last_seen_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (quote_id, quote_data['quote_text'], quote_data['author_name'], quote_data['author_url'], quote_data['tags_json'], now, now)
+                    (quote_id, quote.quote_text, quote.author_name, quote.author_url, tags_json, now, now)
                 )
-                return 'new'
+                return 'new', None
 
     def record_observation(self, run_id, quote_id):
         with self._get_connection() as conn:
@@ -116,24 +132,27 @@ class Database:
             )
             conn.commit()
 
+    def record_run_diffs(self, run_id, diffs):
+        """Store a run's change set. `diffs` holds (quote_id, change_type, tags_before_json, tags_after_json)."""
+        with self._get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO run_diffs (run_id, quote_id, change_type, tags_before_json, tags_after_json) VALUES (?, ?, ?, ?, ?)",
+                ((run_id,) + tuple(diff) for diff in diffs)
+            )
+            conn.commit()
+
     def get_last_run(self):
         with self._get_connection() as conn:
             cursor = conn.execute("SELECT * FROM runs ORDER BY started_at DESC LIMIT 1")
-            row = cursor.fetchone()
-            if row:
-                columns = [column[0] for column in cursor.description]
-                return dict(zip(columns, row))
-            return None
+            return cursor.fetchone()
 
-    def get_quotes_from_run(self, run_id):
+    def get_quote_ids_from_run(self, run_id):
         with self._get_connection() as conn:
-            cursor = conn.execute('''
-                SELECT q.* FROM quotes q
-                JOIN quote_observations o ON q.quote_id = o.quote_id
-                WHERE o.run_id = ?
-            ''', (run_id,))
-            columns = [column[0] for column in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor = conn.execute(
+                "SELECT quote_id FROM quote_observations WHERE run_id = ?",
+                (run_id,)
+            )
+            return {row[0] for row in cursor}
 
     def get_previous_run_id(self, current_run_id):
         with self._get_connection() as conn:
@@ -149,5 +168,80 @@ class Database:
     def get_all_quotes(self):
         with self._get_connection() as conn:
             cursor = conn.execute("SELECT * FROM quotes")
-            columns = [column[0] for column in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return cursor.fetchall()
+
+    # Window over successful runs shared by the trend queries. LIMIT -1 means no limit.
+    _TREND_WINDOW = '''
+        WITH window_runs AS (
+            SELECT run_id, started_at, quotes_seen FROM runs
+            WHERE status = 'success'
+            AND (:since IS NULL OR started_at >= :since)
+            AND (:until IS NULL OR started_at < :until)
+            ORDER BY started_at DESC
+            LIMIT :last_runs
+        )
+    '''
+
+    _TREND_BUCKETS = {
+        'run': "w.run_id",
+        'day': "substr(w.started_at, 1, 10)",
+        # ISO 8601 week (Monday start, YYYY-Www); the week's Thursday decides its year
+        'week': "printf('%s-W%02d', strftime('%Y', date(w.started_at, 'weekday 0', '-3 days')), "
+                "(strftime('%j', date(w.started_at, 'weekday 0', '-3 days')) - 1) / 7 + 1)",
+        'month': "substr(w.started_at, 1, 7)",
+    }
+
+    def _trend_params(self, since, until, last_runs):
+        return {
+            'since': since,
+            'until': until,
+            'last_runs': last_runs if last_runs is not None else -1,
+        }
+
+    def get_run_diff_trends(self, by='day', since=None, until=None, last_runs=None):
+        bucket = self._TREND_BUCKETS[by]
+        with self._get_connection() as conn:
+            cursor = conn.execute(self._TREND_WINDOW + f'''
+                SELECT
+                    {bucket} AS bucket,
+                    COUNT(DISTINCT w.run_id) AS runs,
+                    MIN(w.started_at) AS first_started_at,
+                    MAX(w.quotes_seen) AS quotes_seen,
+                    COALESCE(SUM(d.change_type = 'new'), 0) AS new,
+                    COALESCE(SUM(d.change_type = 'changed'), 0) AS changed,
+                    COALESCE(SUM(d.change_type = 'disappeared'), 0) AS disappeared,
+                    COALESCE(SUM(d.change_type = 'reappeared'), 0) AS reappeared,
+                    COUNT(d.quote_id) AS churn,
+                    COALESCE(SUM(d.change_type IN ('new', 'reappeared')), 0) - COALESCE(SUM(d.change_type = 'disappeared'), 0) AS net_growth
+                FROM window_runs w
+                LEFT JOIN run_diffs d ON d.run_id = w.run_id
+                GROUP BY bucket
+                ORDER BY first_started_at
+            ''', self._trend_params(since, until, last_runs))
+            return cursor.fetchall()
+
+    def get_tag_drift(self, since=None, until=None, last_runs=None, limit=10):
+        # A tag counts as added when it is in the after-set but not the before-set, and vice versa.
+        # Only edits to existing quotes count; new and disappeared quotes are growth, not drift.
+        with self._get_connection() as conn:
+            cursor = conn.execute(self._TREND_WINDOW + '''
+                , drift AS (
+                    SELECT a.value AS tag, 1 AS added, 0 AS removed
+                    FROM window_runs w
+                    JOIN run_diffs d ON d.run_id = w.run_id, json_each(d.tags_after_json) a
+                    WHERE d.change_type IN ('changed', 'reappeared')
+                    AND NOT EXISTS (SELECT 1 FROM json_each(d.tags_before_json) b WHERE b.value = a.value)
+                    UNION ALL
+                    SELECT b.value AS tag, 0 AS added, 1 AS removed
+                    FROM window_runs w
+                    JOIN run_diffs d ON d.run_id = w.run_id, json_each(d.tags_before_json) b
+                    WHERE d.change_type IN ('changed', 'reappeared')
+                    AND NOT EXISTS (SELECT 1 FROM json_each(d.tags_after_json) a WHERE a.value = b.value)
+                )
+                SELECT tag, SUM(added) AS added, SUM(removed) AS removed, SUM(added) - SUM(removed) AS net
+                FROM drift
+                GROUP BY tag
+                ORDER BY SUM(added) + SUM(removed) DESC, tag
+                LIMIT :limit
+            ''', dict(self._trend_params(since, until, last_runs), limit=limit))
+            return cursor.fetchall()
@@ -1,7 +1,7 @@
-import json
 import logging
 from datetime import datetime
 from quote_pulse.database import Database
+from quote_pulse.models import QuoteRecord
 from quote_pulse.scraper import Scraper
 
 logger = logging.getLogger(__name__)
@@ -21,38 +21,48 @@ class Engine:
             new_quotes = []
             changed_quotes = []
             seen_quote_ids = set()
+            # (quote_id, change_type, tags_before_json, tags_after_json) rows for run_diffs
+            diffs = []
+
+            # Needed up front so quotes that come back after a gap are recorded as reappeared
+            prev_run_id = self.db.get_previous_run_id(run_id)
+            prev_ids = self.db.get_quote_ids_from_run(prev_run_id) if prev_run_id else set()
             
             for q in quotes:
-                quote_data = {
-                    "quote_id": q["quote_id"],
-                    "quote_text": q["quote_text"],
-                    "author_name": q["author_name"],
-                    "author_url": q["author_url"],
-                    "tags_json": json.dumps(q["tags"]),
-                }
-                
-                status = self.db.upsert_quote(quote_data)
-                self.db.record_observation(run_id, q["quote_id"])
-                seen_quote_ids.add(q["quote_id"])
+                # A quote listed twice in one scrape was already recorded the first time
+                if q.quote_id in seen_quote_ids:
+                    continue
+
+                status, previous_tags_json = self.db.upsert_quote(q)
+                self.db.record_observation(run_id, q.quote_id)
+                seen_quote_ids.add(q.quote_id)
                 
                 if status == 'new':
                     new_quotes.append(q)
+                    diffs.append((q.quote_id, 'new', None, q.tags_json))
+                    continue
+
+                # A quote coming back counts as reappeared even if its tags changed
+                # while it was gone, matching what run_diffs (and so `trends`) records
+                if prev_run_id and q.quote_id not in prev_ids:
+                    diffs.append((q.quote_id, 'reappeared', previous_tags_json, q.tags_json))
                 elif status == 'updated':
                     changed_quotes.append(q)
+                    diffs.append((q.quote_id, 'changed', previous_tags_json, q.tags_json))
 
             # Detect disappeared quotes
             disappeared_quotes = []
-            prev_run_id = self.db.get_previous_run_id(run_id)
             if prev_run_id:
-                prev_quotes = self.db.get_quotes_from_run(prev_run_id)
-                prev_ids = {pq['quote_id'] for pq in prev_quotes}
                 disappeared_ids = prev_ids - seen_quote_ids
                 
                 # Fetch disappeared quote details from DB
                 for d_id in disappeared_ids:
                     d_quote = self.db.get_quote(d_id)
                     if d_quote:
-                        disappeared_quotes.append(d_quote)
+                        disappeared_quotes.append(QuoteRecord.from_row(d_quote))
+                        diffs.append((d_id, 'disappeared', d_quote['tags_json'], None))
+
+            self.db.record_run_diffs(run_id, diffs)
 
             self.db.finish_run(run_id, pages_scraped, len(seen_quote_ids), status='success')
             
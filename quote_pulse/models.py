@@ -0,0 +1,50 @@
+import json
+import sys
+from typing import NamedTuple, Optional, Tuple
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+class QuoteRecord(NamedTuple):
+    """A single quote as it travels from the scraper through the engine to the reports.
+
+    Tuple-backed so that a run holding thousands of quotes doesn't carry a
+    per-quote dict. Author names, tags and page URLs repeat heavily across a
+    run, so `build` interns them and every record shares the same strings.
+    """
+    quote_id: str
+    quote_text: str
+    author_name: str
+    author_url: Optional[str]
+    tags: Tuple[str, ...]
+    page_url: Optional[str] = None
+    scraped_at: Optional[str] = None
+
+    @classmethod
+    def build(cls, quote_id, quote_text, author_name, author_url, tags, page_url=None, scraped_at=None):
+        return cls(
+            quote_id,
+            quote_text,
+            sys.intern(author_name),
+            _intern(author_url),
+            tuple(sys.intern(tag) for tag in tags),
+            _intern(page_url),
+            scraped_at,
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        # Rows come straight from the `quotes` table (see Database.get_quote)
+        return cls.build(
+            row['quote_id'],
+            row['quote_text'],
+            row['author_name'],
+            row['author_url'],
+            json.loads(row['tags_json']) if row['tags_json'] else (),
+        )
+
+    @property
+    def tags_json(self):
+        return json.dumps(list(self.tags))
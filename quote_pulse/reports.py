@@ -1,24 +1,227 @@
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from fpdf import FPDF
 from collections import Counter
 
+# Full-detail PDFs are split into parts of at most this many quotes, so a
+# single FPDF document never holds every change of a large run in memory.
+PDF_CHUNK_SIZE = 2000
+
+# Part files render in parallel, but each worker holds a whole FPDF document
+# (~70 MiB), so the pool stays small regardless of the machine's core count.
+PDF_WORKERS = 2
+
+# DejaVu Sans covers the curly quotes, dashes and accented author names that
+# the core Helvetica font can only render as '?'.
+UNICODE_FONT_DIRS = [
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu-sans-fonts",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/Library/Fonts",
+    "C:/Windows/Fonts",
+]
+UNICODE_FONT_FILES = {
+    '': "DejaVuSans.ttf",
+    'B': "DejaVuSans-Bold.ttf",
+    'I': "DejaVuSans-Oblique.ttf",
+}
+
+@lru_cache(maxsize=None)
+def find_unicode_fonts():
+    """Return a {style: ttf_path} map for report text, or None to fall back to Helvetica.
+
+    Only the file lookup is cached: fpdf2 parses a TTF per document and cannot
+    share a parsed font between documents, so every StyledPDF created with
+    unicode=True pays for add_font again.
+    QUOTEPULSE_FONT may point at any TTF file; it is then used for every style.
+    """
+    override = os.environ.get("QUOTEPULSE_FONT")
+    if override and os.path.isfile(override):
+        return {style: override for style in UNICODE_FONT_FILES}
+
+    for font_dir in UNICODE_FONT_DIRS:
+        regular = os.path.join(font_dir, UNICODE_FONT_FILES[''])
+        if not os.path.isfile(regular):
+            continue
+        fonts = {}
+        for style, name in UNICODE_FONT_FILES.items():
+            path = os.path.join(font_dir, name)
+            # Missing bold/italic variants fall back to the regular face
+            fonts[style] = path if os.path.isfile(path) else regular
+        return fonts
+    return None
+
+
+def _needs_unicode(quotes):
+    # True when Helvetica's latin-1 encoding would mangle some of this text
+    for q in quotes:
+        try:
+            q.quote_text.encode('latin-1')
+            q.author_name.encode('latin-1')
+        except UnicodeEncodeError:
+            return True
+    return False
+
+
+class StyledPDF(FPDF):
+    def __init__(self, unicode=True):
+        super().__init__()
+        fonts = find_unicode_fonts() if unicode else None
+        # Maps each requested body style to the style it was registered under
+        self.body_styles = {style: style for style in UNICODE_FONT_FILES}
+        if fonts:
+            # add_font parses the TTF immediately, so each distinct file is registered
+            # once and styles that fall back to the same file reuse that registration
+            registered = {}
+            for style, path in fonts.items():
+                if path not in registered:
+                    self.add_font("DejaVu", style, path)
+                    registered[path] = style
+                self.body_styles[style] = registered[path]
+            self.body_font = "DejaVu"
+        else:
+            self.body_font = "Helvetica"
+        self.set_auto_page_break(auto=True, margin=15)
+
+    def set_body_font(self, style, size):
+        self.set_font(self.body_font, self.body_styles[style], size)
+
+    def clean(self, text):
+        # Core fonts only understand latin-1; a TTF font takes the text as-is
+        if self.body_font == "Helvetica":
+            return text.encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def header(self):
+        self.set_fill_color(52, 73, 94) # Dark blue/gray
+        self.rect(0, 0, 210, 40, 'F')
+        self.set_text_color(255, 255, 255)
+        self.set_font("Helvetica", "B", 24)
+        self.cell(0, 30, "QuotePulse Report", align='C', ln=True)
+        self.ln(10)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Helvetica", "I", 8)
+        self.set_text_color(128, 128, 128)
+        self.cell(0, 10, f"Page {self.page_no()} | Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}", align='C')
+
+    def section_title(self, title):
+        self.set_font("Helvetica", "B", 16)
+        self.set_fill_color(236, 240, 241)
+        self.set_text_color(44, 62, 80)
+        self.cell(0, 12, f" {title}", ln=True, fill=True)
+        self.ln(5)
+
+    def wrap(self, text, width):
+        """Greedy word wrap for the current font, or None if a single word is wider than a line.
+
+        multi_cell re-measures the whole line for every character it adds, which
+        dominates full-report rendering; here every word is measured once.
+        """
+        space = self.get_string_width(" ")
+        lines, current, current_width = [], [], 0
+        for word in text.split():
+            word_width = self.get_string_width(word)
+            if word_width > width:
+                return None
+            if current and current_width + space + word_width > width:
+                lines.append(" ".join(current))
+                current, current_width = [], 0
+            current_width += (space if current else 0) + word_width
+            current.append(word)
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+    def quote_entry(self, q, note=None):
+        self.set_body_font("I", 11)
+        text = self.clean(f"\"{q.quote_text}\"")
+        # cell() pads its text by c_margin on both sides
+        lines = self.wrap(text, self.epw - 2 * self.c_margin)
+        if lines is None:
+            self.multi_cell(0, 7, text)
+        else:
+            for line in lines:
+                self.cell(0, 7, line, ln=True)
+
+        self.set_body_font("B", 10)
+        self.set_text_color(127, 140, 141)
+        self.cell(0, 6, self.clean(f"-- {q.author_name}"), ln=True, align='R')
+        if note:
+            self.set_body_font("", 9)
+            self.cell(0, 5, self.clean(note), ln=True, align='R')
+        self.ln(4)
+        self.set_text_color(44, 62, 80)
+
+
+# (results key, section title, markdown anchor)
+REPORT_SECTIONS = [
+    ('new_quotes', "New Quotes", "new-quotes"),
+    ('changed_quotes', "Changed Quotes", "changed-quotes"),
+    ('disappeared_quotes', "Disappeared Quotes", "disappeared-quotes"),
+]
+
+def _tags_note(q):
+    return f"Tags: {', '.join(q.tags)}" if q.tags else "Tags: (none)"
+
+def _plan_pdf_parts(results, chunk_size):
+    """Split every section into parts of at most `chunk_size` quotes.
+
+    Returns a list of parts, each a list of (section_key, title, start, end) slices.
+    """
+    parts = []
+    current, room = [], chunk_size
+    for key, title, _ in REPORT_SECTIONS:
+        total = len(results[key])
+        start = 0
+        while start < total:
+            end = min(total, start + room)
+            current.append((key, title, start, end))
+            room -= end - start
+            start = end
+            if room == 0:
+                parts.append(current)
+                current, room = [], chunk_size
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _render_pdf_part(filename, slices):
+    # Module-level so ProcessPoolExecutor can pickle it
+    pdf = StyledPDF()
+    pdf.add_page()
+    pdf.set_y(50)
+    for title, start, end, total, quotes in slices:
+        # Each slice also becomes an entry in the PDF outline
+        pdf.start_section(f"{title} {start + 1}-{end}")
+        pdf.section_title(f"{title} ({start + 1}-{end} of {total})")
+        for q in quotes:
+            pdf.quote_entry(q, note=_tags_note(q))
+        pdf.ln(5)
+    pdf.output(filename)
+
+
 class ReportGenerator:
     def __init__(self, db):
         self.db = db
 
-    def generate_all(self, run_results):
+    def generate_all(self, run_results, full=False):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         run_id = run_results['run_id']
         
-        md_path = self.generate_markdown(run_results, timestamp)
-        pdf_path = self.generate_pdf(run_results, timestamp)
+        md_path = self.generate_markdown(run_results, timestamp, full=full)
+        pdf_path = self.generate_pdf(run_results, timestamp, full=full)
         stats_path = self.generate_stats()
         
         return md_path, pdf_path, stats_path
 
-    def generate_markdown(self, results, timestamp):
+    def generate_markdown(self, results, timestamp, full=False):
         os.makedirs("reports", exist_ok=True)
         filename = f"reports/run_{timestamp}.md"
         
@@ -33,41 +236,50 @@ class ReportGenerator:
             f.write(f"- **New Quotes:** {len(results['new_quotes'])}\n")
             f.write(f"- **Changed Quotes (Tags):** {len(results['changed_quotes'])}\n")
             f.write(f"- **Disappeared Quotes:** {len(results['disappeared_quotes'])}\n\n")
+
+            if full:
+                self._write_full_markdown(f, results)
+                return filename
             
             if results['new_quotes']:
                 f.write(f"## New Quotes (Sample 10)\n")
                 for q in results['new_quotes'][:10]:
-                    f.write(f"- \"{q['quote_text']}\" — **{q['author_name']}**\n")
+                    f.write(f"- \"{q.quote_text}\" — **{q.author_name}**\n")
             
             if results['changed_quotes']:
                 f.write(f"## Changed Quotes\n")
                 for q in results['changed_quotes']:
-                    f.write(f"- \"{q['quote_text']}\" — **{q['author_name']}** (Tags updated)\n")
+                    f.write(f"- \"{q.quote_text}\" — **{q.author_name}** (Tags updated)\n")
 
         return filename
 
-    def generate_pdf(self, results, timestamp):
+    def _write_full_markdown(self, f, results):
+        # Every line goes straight to the file, so memory doesn't grow with the change set
+        f.write("## Index\n")
+        for key, title, anchor in REPORT_SECTIONS:
+            f.write(f"- [{title}](#{anchor}) ({len(results[key])})\n")
+        f.write("\n")
+
+        for key, title, _ in REPORT_SECTIONS:
+            f.write(f"## {title}\n")
+            if not results[key]:
+                f.write("_None._\n\n")
+                continue
+            for q in results[key]:
+                f.write(f"- \"{q.quote_text}\" — **{q.author_name}** ({_tags_note(q)})\n")
+            f.write("\n")
+
+    def generate_pdf(self, results, timestamp, full=False, chunk_size=PDF_CHUNK_SIZE, workers=PDF_WORKERS):
         os.makedirs("reports", exist_ok=True)
         filename = f"reports/run_{timestamp}.pdf"
-        
-        class StyledPDF(FPDF):
-            def header(self):
-                self.set_fill_color(52, 73, 94) # Dark blue/gray
-                self.rect(0, 0, 210, 40, 'F')
-                self.set_text_color(255, 255, 255)
-                self.set_font("Helvetica", "B", 24)
-                self.cell(0, 30, "QuotePulse Report", align='C', ln=True)
-                self.ln(10)
-
-            def footer(self):
-                self.set_y(-15)
-                self.set_font("Helvetica", "I", 8)
-                self.set_text_color(128, 128, 128)
-                self.cell(0, 10, f"Page {self.page_no()} | Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}", align='C')
-
-        pdf = StyledPDF()
+
+        parts = _plan_pdf_parts(results, chunk_size) if full else []
+        part_filenames = [f"reports/run_{timestamp}_part{i:03d}.pdf" for i in range(1, len(parts) + 1)]
+
+        # The full-mode index page only uses Helvetica; the sample only needs the
+        # TTF font (and its parsing cost) when Helvetica can't encode the quotes
+        pdf = StyledPDF(unicode=not full and _needs_unicode(results['new_quotes'][:10]))
         pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=15)
         
         # Metadata Section
         pdf.set_y(50)
@@ -92,10 +304,7 @@ class ReportGenerator:
         pdf.ln(10)
 
         # Summary Table-like structure
-        pdf.set_font("Helvetica", "B", 16)
-        pdf.set_fill_color(236, 240, 241)
-        pdf.cell(0, 12, " Scraping Summary", ln=True, fill=True)
-        pdf.ln(5)
+        pdf.section_title("Scraping Summary")
         
         pdf.set_font("Helvetica", "", 12)
         
@@ -113,28 +322,35 @@ class ReportGenerator:
         
         pdf.ln(10)
 
-        # New Quotes Section
-        if results['new_quotes']:
-            pdf.set_font("Helvetica", "B", 16)
-            pdf.set_fill_color(236, 240, 241)
-            pdf.cell(0, 12, " New Quotes Sample", ln=True, fill=True)
-            pdf.ln(5)
-            
+        if full:
+            # Section index: which part file holds which slice of each section
+            pdf.section_title("Section Index")
+            pdf.set_font("Helvetica", "", 11)
+            for part_filename, part in zip(part_filenames, parts):
+                for _, title, start, end in part:
+                    pdf.cell(0, 7, f"  {title} {start + 1}-{end}: {os.path.basename(part_filename)}", ln=1)
+            if not parts:
+                pdf.cell(0, 7, "  No changes in this run.", ln=1)
+        elif results['new_quotes']:
+            # New Quotes Section
+            pdf.section_title("New Quotes Sample")
             for q in results['new_quotes'][:10]:
-                pdf.set_font("Helvetica", "I", 11)
-                text = f"\"{q['quote_text']}\""
-                text = text.encode('latin-1', 'replace').decode('latin-1')
-                pdf.multi_cell(0, 7, text)
-                
-                pdf.set_font("Helvetica", "B", 10)
-                pdf.set_text_color(127, 140, 141)
-                author = f"-- {q['author_name']}"
-                author = author.encode('latin-1', 'replace').decode('latin-1')
-                pdf.cell(0, 6, author, ln=True, align='R')
-                pdf.ln(4)
-                pdf.set_text_color(44, 62, 80)
+                pdf.quote_entry(q)
 
         pdf.output(filename)
+
+        # Parts are independent documents, so they render in parallel; each worker
+        # only ever holds the slices of the part it is rendering
+        jobs = [
+            (part_filename, [(title, start, end, len(results[key]), results[key][start:end]) for key, title, start, end in part])
+            for part_filename, part in zip(part_filenames, parts)
+        ]
+        if len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(len(jobs), workers, os.cpu_count() or 1)) as executor:
+                list(executor.map(_render_pdf_part, *zip(*jobs)))
+        elif jobs:
+            _render_pdf_part(*jobs[0])
+
         return filename
 
     def generate_stats(self):
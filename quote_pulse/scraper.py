@@ -4,6 +4,7 @@ import hashlib
 import string
 import logging
 from datetime import datetime
+from quote_pulse.models import QuoteRecord
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -87,6 +88,9 @@ class Scraper:
                 if not quotes and success:
                     logger.warning(f"No quotes found on {current_url} even though it seemed to load.")
 
+                # One timestamp per page, shared by every quote on it
+                scraped_at = datetime.utcnow().isoformat()
+
                 for quote_el in quotes:
                     try:
                         text = quote_el.find_element(By.CLASS_NAME, "text").text
@@ -109,15 +113,15 @@ class Scraper:
                         
                         quote_id = self._generate_id(text, author)
                         
-                        all_quotes.append({
-                            "quote_id": quote_id,
-                            "quote_text": text,
-                            "author_name": author,
-                            "author_url": author_url,
-                            "tags": tags,
-                            "page_url": current_url,
-                            "scraped_at": datetime.utcnow().isoformat()
-                        })
+                        all_quotes.append(QuoteRecord.build(
+                            quote_id,
+                            text,
+                            author,
+                            author_url,
+                            tags,
+                            page_url=current_url,
+                            scraped_at=scraped_at,
+                        ))
                     except (StaleElementReferenceException, NoSuchElementException) as e:
                         logger.warning(f"Error extracting quote: {e}")
                         continue